@@ -6,18 +6,33 @@ import io
 import logging
 import threading
 import time
-from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from dataclasses import dataclass, field, fields, replace
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional
 
 try:  # pragma: no cover - import side effect only validated on device
-    from picamera2 import Picamera2
+    from picamera2 import MappedArray, Picamera2
     from libcamera import controls as libcamera_controls
+    from picamera2.encoders import JpegEncoder, MJPEGEncoder, Quality
+    from picamera2.outputs import FileOutput
 except ImportError:  # pragma: no cover - allows development without hardware
     Picamera2 = None  # type: ignore
+    MappedArray = None  # type: ignore
     libcamera_controls = None  # type: ignore
+    JpegEncoder = None  # type: ignore
+    MJPEGEncoder = None  # type: ignore
+    Quality = None  # type: ignore
+    FileOutput = None  # type: ignore
 
 PICAMERA_AVAILABLE = Picamera2 is not None
 
+try:  # pragma: no cover - optional accelerated encoder
+    from turbojpeg import TJPF_RGB, TJSAMP_420, TurboJPEG
+except ImportError:  # pragma: no cover - Pillow fallback is used instead
+    TurboJPEG = None  # type: ignore
+    TJPF_RGB = None  # type: ignore
+    TJSAMP_420 = None  # type: ignore
+
 from PIL import Image
 
 logger = logging.getLogger(__name__)
@@ -25,12 +40,15 @@ logger = logging.getLogger(__name__)
 
 JPEG_BOUNDARY = "frame"
 DEFAULT_STREAM_SIZE = (640, 480)
+DEFAULT_LORES_SIZE = (320, 240)
 DEFAULT_FPS = 15
-DEFAULT_JPEG_QUALITY = 92
+DEFAULT_JPEG_QUALITY = 85
+DEFAULT_BUFFER_COUNT = 4
 
 DEFAULT_SATURATION = 1.15
 DEFAULT_CONTRAST = 1.05
 DEFAULT_SHARPNESS = 1.10
+DEFAULT_BRIGHTNESS = 0.0
 
 _AWB_MODE_ATTRS: Dict[str, str] = {
     "auto": "AwbAuto",
@@ -72,6 +90,7 @@ def apply_color_and_quality(
     contrast: Optional[float] = None,
     sharpness: Optional[float] = None,
     ev: Optional[float] = None,
+    brightness: Optional[float] = None,
 ) -> None:
     """Apply color-related controls to the active frame provider."""
 
@@ -88,6 +107,8 @@ def apply_color_and_quality(
         patch["sharpness"] = float(sharpness)
     if ev is not None:
         patch["ev"] = float(ev)
+    if brightness is not None:
+        patch["brightness"] = float(brightness)
 
     if not patch:
         return
@@ -134,6 +155,32 @@ def set_zoom(level: float) -> float:
     return current_zoom
 
 
+def _create_turbojpeg() -> Any | None:
+    """Return a TurboJPEG encoder if libjpeg-turbo can be loaded."""
+
+    if TurboJPEG is None:
+        return None
+    try:
+        return TurboJPEG()
+    except Exception:  # pragma: no cover - depends on system libturbojpeg
+        logger.warning("libturbojpeg not loadable; using Pillow JPEG encoder", exc_info=True)
+        return None
+
+
+@lru_cache(maxsize=32)
+def _zoom_crop(zoom: float, sensor_w: int, sensor_h: int) -> tuple[int, int, int, int]:
+    """Return the centred ScalerCrop rectangle for ``zoom`` on the sensor."""
+
+    scale = 1.0 / zoom
+    crop_w = max(1, int(sensor_w * scale))
+    crop_h = max(1, int(sensor_h * scale))
+    return (sensor_w - crop_w) // 2, (sensor_h - crop_h) // 2, crop_w, crop_h
+
+
+def _yuv_rows_padded(stream_config: Dict[str, Any]) -> bool:
+    return stream_config["stride"] != stream_config["size"][0]
+
+
 def _resolve_awb_enum(preset: str) -> Any:
     if libcamera_controls is None:
         return None
@@ -143,9 +190,122 @@ def _resolve_awb_enum(preset: str) -> Any:
     return getattr(libcamera_controls.AwbModeEnum, name, None)
 
 
-@dataclass
+class _JpegSink:
+    """File-like sink handed to Picamera2's FileOutput for encoded frames."""
+
+    def __init__(self, provider: "FrameProvider") -> None:
+        self._provider = provider
+
+    def write(self, data: Any) -> int:
+        jpeg = bytes(data)
+        self._provider._publish_jpeg(jpeg)
+        return len(jpeg)
+
+    def flush(self) -> None:
+        return
+
+
+_MjpegParts = tuple[bytes, bytes, bytes]
+_Published = tuple[int, Optional[bytes], Optional[_MjpegParts]]
+
+
+class _FrameSlot:
+    """Latest encoded frame of one stream plus the future its async waiters share.
+
+    A single producer thread publishes ``(sequence, jpeg, parts)`` as one
+    reference, so readers never lock; ``parts`` is the MJPEG framing built
+    once per frame and shared by every client. Waiting records demand so the
+    encoder can skip streams nobody is watching.
+    """
+
+    __slots__ = ("latest", "_demand_until", "_loop", "_future", "_closed")
+
+    def __init__(self) -> None:
+        self.latest: _Published = (0, None, None)
+        self._demand_until = 0.0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._future: asyncio.Future[None] | None = None
+        self._closed = False
+
+    def open(self) -> None:
+        self._closed = False
+
+    def close(self) -> None:
+        """Release every waiter with None; used when the provider stops."""
+        self._closed = True
+        self.wake()
+
+    def wanted(self) -> bool:
+        return time.monotonic() < self._demand_until
+
+    def publish(self, jpeg: bytes) -> None:
+        self.latest = (self.latest[0] + 1, jpeg, mjpeg_frame_parts(jpeg))
+        self.wake()
+
+    def wake(self) -> None:
+        loop = self._loop
+        # Nobody is awaiting this stream; skip the cross-thread loop wakeup.
+        if loop is None or self._future is None:
+            return
+        try:
+            loop.call_soon_threadsafe(self._resolve)
+        except RuntimeError:  # event loop already closed during shutdown
+            self._loop = None
+
+    def _resolve(self) -> None:
+        # Detach before resolving so waiters arriving later get a new future
+        # for the next frame; every current waiter wakes exactly once.
+        future = self._future
+        self._future = None
+        if future is not None and not future.done():
+            future.set_result(None)
+
+    async def wait(self, timeout: float, after: int | None = None) -> _Published | None:
+        """Wait for the next frame, or return at once if one newer than ``after`` exists.
+
+        Only the newest frame is ever handed out, so a client that fell behind
+        skips the frames it missed instead of queueing them.
+        """
+        now = time.monotonic()
+        deadline = now + timeout
+        self._demand_until = deadline + 1.0
+        latest = self.latest
+        seen = latest[0] if after is None else after
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+        while not self._closed:
+            if latest[0] > seen and latest[1] is not None:
+                return latest
+            if self._future is None:
+                self._future = self._loop.create_future()
+            future = self._future
+            # A publish between reading ``latest`` and creating the future
+            # found no future and skipped the wakeup; pick it up here.
+            latest = self.latest
+            if latest[0] > seen and latest[1] is not None:
+                return latest
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            try:
+                # shield() keeps a timed-out client from cancelling the shared
+                # future, and waiting on a plain future avoids a Task per client.
+                await asyncio.wait_for(asyncio.shield(future), remaining)
+            except asyncio.TimeoutError:
+                return None
+            # A resolve queued for a frame this client already had (or a
+            # close) wakes it too; only a newer sequence counts.
+            latest = self.latest
+        return None
+
+
+@dataclass(frozen=True, slots=True)
 class CameraSettings:
-    """Serializable camera configuration."""
+    """Serializable camera configuration.
+
+    Instances are immutable; ``from_patch`` builds a new one, so the
+    serialized form is computed once per instance.
+    """
 
     exposure_mode: str = "auto"
     exposure_time_us: int = 5000
@@ -155,46 +315,60 @@ class CameraSettings:
     contrast: float = DEFAULT_CONTRAST
     saturation: float = DEFAULT_SATURATION
     sharpness: float = DEFAULT_SHARPNESS
+    brightness: float = DEFAULT_BRIGHTNESS
     ev: float = 0.0
     low_light: bool = False
     zoom: float = 1.0
+    _dict: Dict[str, object] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self,
+            "_dict",
+            {
+                "exposure_mode": self.exposure_mode,
+                "exposure_time_us": self.exposure_time_us,
+                "iso_gain": self.iso_gain,
+                "awb_enable": self.awb_enable,
+                "awb_mode": self.awb_mode,
+                "contrast": self.contrast,
+                "saturation": self.saturation,
+                "sharpness": self.sharpness,
+                "brightness": self.brightness,
+                "ev": self.ev,
+                "low_light": self.low_light,
+                "zoom": self.zoom,
+            },
+        )
 
     def to_dict(self) -> Dict[str, object]:
-        return {
-            "exposure_mode": self.exposure_mode,
-            "exposure_time_us": self.exposure_time_us,
-            "iso_gain": self.iso_gain,
-            "awb_enable": self.awb_enable,
-            "awb_mode": self.awb_mode,
-            "contrast": self.contrast,
-            "saturation": self.saturation,
-            "sharpness": self.sharpness,
-            "ev": self.ev,
-            "low_light": self.low_light,
-            "zoom": self.zoom,
-        }
+        """Return the cached serialized form; callers must not mutate it."""
+
+        return self._dict
 
     @classmethod
     def from_patch(cls, current: "CameraSettings", payload: Dict[str, object]) -> "CameraSettings":
-        data = current.to_dict()
-        for key, value in payload.items():
-            if key not in data:
+        for key in payload:
+            if key not in _CAMERA_SETTING_FIELDS:
                 raise ValueError(f"Unsupported setting: {key}")
-            data[key] = value
+        changes = dict(payload)
         if "low_light" in payload and "awb_mode" not in payload:
             if bool(payload["low_light"]):
-                data["awb_mode"] = "low_light"
-            elif str(data.get("awb_mode", "auto")).lower() == "low_light":
-                data["awb_mode"] = "auto"
+                changes["awb_mode"] = "low_light"
+            elif str(current.awb_mode).lower() == "low_light":
+                changes["awb_mode"] = "auto"
 
-        awb_mode = str(data.get("awb_mode", "auto")).lower()
+        awb_mode = str(changes.get("awb_mode", current.awb_mode)).lower()
         if awb_mode == "low_light":
-            data["low_light"] = True
-            data["awb_enable"] = True
+            changes["low_light"] = True
+            changes["awb_enable"] = True
         else:
-            data["low_light"] = False
+            changes["low_light"] = False
+
+        return replace(current, **changes)
 
-        return cls(**data)
+
+_CAMERA_SETTING_FIELDS = frozenset(f.name for f in fields(CameraSettings) if f.init)
 
 
 class FrameProvider:
@@ -205,12 +379,20 @@ class FrameProvider:
         resolution: tuple[int, int] = DEFAULT_STREAM_SIZE,
         fps: int = DEFAULT_FPS,
         jpeg_quality: int = DEFAULT_JPEG_QUALITY,
+        hardware_jpeg: bool = False,
+        client_count_fn: Callable[[], int] | None = None,
+        lores_resolution: tuple[int, int] | None = DEFAULT_LORES_SIZE,
     ) -> None:
         if Picamera2 is None:
             raise RuntimeError("Picamera2 is not available. Install picamera2 on the Pi.")
 
         self._resolution = resolution
+        self._lores_resolution = lores_resolution
         self._fps = fps
+        self._hardware_jpeg = bool(hardware_jpeg) and MJPEGEncoder is not None
+        self._recording = False
+        self._encoder_name: str | None = None
+        self._client_count_fn = client_count_fn
         try:
             self._jpeg_quality = max(1, min(95, int(jpeg_quality)))
         except (TypeError, ValueError):
@@ -220,91 +402,322 @@ class FrameProvider:
             self._picam.options["quality"] = self._jpeg_quality
         except Exception:
             logger.debug("Unable to set Picamera2 JPEG quality option", exc_info=True)
+        self._tj = _create_turbojpeg()
+        self._stream_format = "BGR888"
+        self._jpeg_buffer = io.BytesIO()
         self._settings = CameraSettings()
         self._low_light_enabled = False
         self._default_frame_limits: tuple[int, int] | None = None
         self._sensor_resolution = getattr(self._picam, "sensor_resolution", None)
+        self._applied_controls: Dict[str, Any] = {}
 
         self._lock = threading.Lock()
         self._condition = threading.Condition(self._lock)
-        self._last_jpeg: Optional[bytes] = None
+        self._main = _FrameSlot()
+        self._lores: _FrameSlot | None = None
+        self._sync_waiters = 0
         self._running = False
         self._thread: Optional[threading.Thread] = None
+        self._encode_thread: Optional[threading.Thread] = None
+
+        # Single-slot handoff of captured requests to the encoder thread.
+        self._raw_lock = threading.Lock()
+        self._raw_event = threading.Event()
+        self._raw_slot: Any | None = None
 
     def start(self) -> None:
         if self._running:
             return
 
+        self._main.open()
         frame_limit = (int(1e6 / self._fps), int(1e6 / self._fps))
         self._default_frame_limits = frame_limit
-        stream_config = self._picam.create_video_configuration(
-            main={"size": self._resolution, "format": "BGR888"},
-            controls={"FrameDurationLimits": frame_limit},
-        )
-        self._picam.configure(stream_config)
+        can_encode_yuv = self._can_encode_yuv()
+        stream_format = "YUV420" if can_encode_yuv else "BGR888"
+        # The lores stream is YUV420 only and Picamera2's encoders ignore it.
+        lores_size = self._lores_resolution if can_encode_yuv and not self._hardware_jpeg else None
+        self._picam.configure(self._stream_config(stream_format, lores_size, frame_limit))
+
+        # encode_from_yuv needs tightly packed planes.
+        camera_config = self._picam.camera_config
+        reconfigure = False
+        if stream_format == "YUV420" and _yuv_rows_padded(camera_config["main"]):
+            logger.info("YUV420 rows are padded; capturing BGR888 instead")
+            stream_format = "BGR888"
+            reconfigure = True
+        if lores_size is not None and _yuv_rows_padded(camera_config["lores"]):
+            logger.info("Lores YUV420 rows are padded; low-bandwidth stream disabled")
+            lores_size = None
+            reconfigure = True
+        if reconfigure:
+            self._picam.configure(self._stream_config(stream_format, lores_size, frame_limit))
+        self._stream_format = stream_format
+        self._lores = _FrameSlot() if lores_size is not None else None
+        self._applied_controls = {"FrameDurationLimits": frame_limit}
         self._apply_controls(self._settings)
-        self._picam.start()
 
         self._running = True
         set_active_frame_provider(self)
+        if self._hardware_jpeg and self._start_recording():
+            logger.info(
+                "Frame provider started at %sx%s @ %sfps (%s)",
+                *self._resolution,
+                self._fps,
+                self._encoder_name,
+            )
+            return
+
+        self._picam.start()
+        self._encode_thread = threading.Thread(
+            target=self._encode_loop, name="FrameProviderEncode", daemon=True
+        )
+        self._encode_thread.start()
         self._thread = threading.Thread(target=self._capture_loop, name="FrameProvider", daemon=True)
         self._thread.start()
         logger.info("Frame provider started at %sx%s @ %sfps", *self._resolution, self._fps)
 
+    def _can_encode_yuv(self) -> bool:
+        return self._tj is not None and hasattr(self._tj, "encode_from_yuv")
+
+    def _stream_config(
+        self,
+        stream_format: str,
+        lores_size: tuple[int, int] | None,
+        frame_limit: tuple[int, int],
+    ) -> Dict[str, Any]:
+        lores = {"size": lores_size, "format": "YUV420"} if lores_size is not None else None
+        return self._picam.create_video_configuration(
+            main={"size": self._resolution, "format": stream_format},
+            lores=lores,
+            controls={"FrameDurationLimits": frame_limit},
+            buffer_count=DEFAULT_BUFFER_COUNT,
+        )
+
+    def _start_recording(self) -> bool:
+        """Stream through a Picamera2 encoder; returns False if none can start.
+
+        The V4L2 MJPEGEncoder is preferred where the SoC has one; otherwise
+        Picamera2's multi-threaded JpegEncoder encodes inside the pipeline.
+        """
+
+        candidates = (
+            # MJPEGEncoder is bitrate-driven; Picamera2 derives the bitrate
+            # from a Quality level, mapped here from jpeg_quality.
+            ("MJPEGEncoder", MJPEGEncoder, {"quality": self._mjpeg_quality()}),
+            ("JpegEncoder", lambda: JpegEncoder(q=self._jpeg_quality), {}),
+        )
+        for name, factory, options in candidates:
+            try:
+                self._picam.start_recording(factory(), FileOutput(_JpegSink(self)), **options)
+            except Exception:  # pragma: no cover - hardware specific failure path
+                logger.warning("%s unavailable", name, exc_info=True)
+                continue
+            self._recording = True
+            self._encoder_name = name
+            return True
+
+        logger.warning("No Picamera2 JPEG encoder available; using the capture loop")
+        return False
+
+    def _mjpeg_quality(self) -> Any:
+        q = self._jpeg_quality
+        if q >= 95:
+            return Quality.VERY_HIGH
+        if q >= 85:
+            return Quality.HIGH
+        if q >= 70:
+            return Quality.MEDIUM
+        if q >= 50:
+            return Quality.LOW
+        return Quality.VERY_LOW
+
     def stop(self) -> None:
         with self._condition:
             self._running = False
             self._condition.notify_all()
+        self._main.close()
+        if self._lores is not None:
+            self._lores.close()
+        self._raw_event.set()
         if self._thread and self._thread.is_alive():
             self._thread.join(timeout=1.0)
         self._thread = None
-        self._picam.stop()
+        if self._encode_thread and self._encode_thread.is_alive():
+            self._encode_thread.join(timeout=1.0)
+        self._encode_thread = None
+        with self._raw_lock:
+            pending, self._raw_slot = self._raw_slot, None
+        if pending is not None:
+            pending.release()
+        if self._recording:
+            self._picam.stop_recording()
+            self._recording = False
+        else:
+            self._picam.stop()
         if get_active_frame_provider() is self:
             set_active_frame_provider(None)
         logger.info("Frame provider stopped")
 
     def _capture_loop(self) -> None:
-        target_delay = 1.0 / self._fps
+        # capture_request() blocks until the sensor delivers the next frame, so
+        # FrameDurationLimits alone paces this loop.
         while self._running:
-            start = time.monotonic()
-            frame = self._picam.capture_array("main")
-            image = Image.fromarray(frame)
-
-            buffer = io.BytesIO()
-            image.save(buffer, format="JPEG", quality=self._jpeg_quality)
-            jpeg = buffer.getvalue()
-
+            request = self._picam.capture_request()
+            if not self._frames_wanted():
+                # Nobody is watching: keep draining the sensor, skip encoding.
+                request.release()
+                continue
+            # Replace any frame the encoder has not picked up yet; only the
+            # newest capture is worth encoding.
+            with self._raw_lock:
+                stale, self._raw_slot = self._raw_slot, request
+            self._raw_event.set()
+            if stale is not None:
+                stale.release()
+
+    def _encode_loop(self) -> None:
+        while self._running:
+            if not self._raw_event.wait(timeout=0.5):
+                continue
+            self._raw_event.clear()
+            with self._raw_lock:
+                request, self._raw_slot = self._raw_slot, None
+            if request is None:
+                continue
+            lores = self._lores
+            encode_main = lores is None or self._sync_waiters > 0 or self._main.wanted()
+            encode_lores = lores is not None and lores.wanted()
+            # Encode straight from the mapped DMA buffers instead of copying
+            # them out with capture_array(), then hand them back promptly.
+            try:
+                if encode_main:
+                    with MappedArray(request, "main") as mapped:
+                        jpeg = self._encode_jpeg(mapped.array)
+                if encode_lores:
+                    with MappedArray(request, "lores") as mapped:
+                        lores_jpeg = self._encode_yuv(mapped.array)
+            finally:
+                request.release()
+            if encode_main:
+                self._publish_jpeg(jpeg)
+            if encode_lores:
+                lores.publish(lores_jpeg)
+
+    def _frames_wanted(self) -> bool:
+        if self._sync_waiters:
+            return True
+        count_fn = self._client_count_fn
+        return count_fn is None or count_fn() > 0
+
+    def _publish_jpeg(self, jpeg: bytes) -> None:
+        # Single writer: the capture/encoder thread or the encoder sink.
+        self._main.publish(jpeg)
+        if self._sync_waiters:
             with self._condition:
-                self._last_jpeg = jpeg
                 self._condition.notify_all()
 
-            elapsed = time.monotonic() - start
-            remaining = target_delay - elapsed
-            if remaining > 0:
-                time.sleep(remaining)
+    def _encode_yuv(self, frame: Any) -> bytes:
+        # The ISP already produced 4:2:0 planes; skip RGB->YCbCr entirely.
+        return self._tj.encode_from_yuv(
+            frame,
+            frame.shape[0] * 2 // 3,
+            frame.shape[1],
+            quality=self._jpeg_quality,
+            jpeg_subsample=TJSAMP_420,
+        )
+
+    def _encode_jpeg(self, frame: Any) -> bytes:
+        if self._stream_format == "YUV420":
+            return self._encode_yuv(frame)
+
+        # Picamera2's BGR888 format yields arrays in [R, G, B] pixel order.
+        if self._tj is not None:
+            return self._tj.encode(
+                frame,
+                quality=self._jpeg_quality,
+                pixel_format=TJPF_RGB,
+                jpeg_subsample=TJSAMP_420,
+            )
+
+        # Rewind without truncating so the scratch allocation keeps its size;
+        # only the bytes written for this frame are copied out.
+        buffer = self._jpeg_buffer
+        buffer.seek(0)
+        if frame.flags["C_CONTIGUOUS"]:
+            # Wrap the mapped buffer in place rather than copying it into PIL.
+            dims = (frame.shape[1], frame.shape[0])
+            image = Image.frombuffer("RGB", dims, frame, "raw", "RGB", 0, 1)
+        else:
+            image = Image.fromarray(frame)
+        image.save(buffer, format="JPEG", quality=self._jpeg_quality)
+        size = buffer.tell()
+        with buffer.getbuffer() as view:
+            return bytes(view[:size])
 
     def _wait_for_jpeg_locked(self, timeout: float = 1.0) -> Optional[bytes]:
+        seq, jpeg, _ = self._main.latest
+        # Stream clients only keep main fresh when no lores stream exists or
+        # someone is waiting on main; a ?q=low-only viewer keeps capture
+        # running while main encoding is gated off.
+        main_fresh = self._lores is None or self._main.wanted()
+        if jpeg is not None and main_fresh and self._frames_wanted():
+            return jpeg
+
+        # Either nothing was captured yet or main encoding is idle and the
+        # cached frame may be stale; registering as a waiter resumes encoding.
         deadline = time.monotonic() + timeout
         with self._condition:
-            if self._last_jpeg is not None:
-                return self._last_jpeg
-
-            while self._running and self._last_jpeg is None:
-                remaining = deadline - time.monotonic()
-                if remaining <= 0:
-                    break
-                self._condition.wait(timeout=remaining)
-
-            return self._last_jpeg
+            # Register before re-checking so a concurrent publish either is
+            # seen here or sees the waiter and notifies.
+            self._sync_waiters += 1
+            try:
+                while self._running and self._main.latest[0] == seq:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(timeout=remaining)
+            finally:
+                self._sync_waiters -= 1
+            return self._main.latest[1]
 
     def get_latest_jpeg(self, wait: bool = True, timeout: float = 1.0) -> Optional[bytes]:
         if not wait:
-            with self._condition:
-                return self._last_jpeg
+            return self._main.latest[1]
         return self._wait_for_jpeg_locked(timeout)
 
-    async def wait_for_jpeg(self, timeout: float = 1.0) -> Optional[bytes]:
-        return await asyncio.to_thread(self._wait_for_jpeg_locked, timeout)
+    async def wait_for_jpeg(self, timeout: float = 1.0, stream: str = "main") -> Optional[bytes]:
+        """Wait for the next published frame; returns None on timeout.
+
+        ``stream="lores"`` selects the low-bandwidth stream when it is
+        configured and falls back to the main stream otherwise.
+        """
+
+        published = await self._slot(stream).wait(timeout)
+        return published[1] if published is not None else None
+
+    async def wait_for_frame_parts(
+        self, timeout: float = 1.0, stream: str = "main", after_seq: Optional[int] = None
+    ) -> Optional[tuple[int, _MjpegParts]]:
+        """Like ``wait_for_jpeg`` but return ``(sequence, parts)``.
+
+        ``parts`` are the shared MJPEG part chunks. Passing the sequence of
+        the last frame sent as ``after_seq`` returns immediately with the
+        newest frame if one was published in the meantime.
+        """
+
+        published = await self._slot(stream).wait(timeout, after_seq)
+        if published is None or published[2] is None:
+            return None
+        return published[0], published[2]
+
+    def _slot(self, stream: str) -> _FrameSlot:
+        if stream == "lores" and self._lores is not None:
+            return self._lores
+        return self._main
+
+    @property
+    def has_lores(self) -> bool:
+        return self._lores is not None
 
     @property
     def settings(self) -> CameraSettings:
@@ -316,11 +729,28 @@ class FrameProvider:
 
     def update_settings(self, patch: Dict[str, object]) -> CameraSettings:
         new_settings = CameraSettings.from_patch(self._settings, patch)
+        if new_settings == self._settings:
+            # A UI re-sync sending the current values must not touch the camera.
+            return self._settings
         self._settings = new_settings
         self._apply_controls(new_settings)
         return new_settings
 
     # Internal utilities -------------------------------------------------
+    def _set_controls(self, controls: Dict[str, Any]) -> None:
+        """Send only the controls whose values differ from those last applied."""
+
+        applied = self._applied_controls
+        delta = {
+            key: value
+            for key, value in controls.items()
+            if key not in applied or applied[key] != value
+        }
+        if not delta:
+            return
+        self._picam.set_controls(delta)
+        applied.update(delta)
+
     def _apply_controls(self, settings: CameraSettings) -> None:
         controls: Dict[str, object] = {}
         if settings.exposure_mode == "auto":
@@ -340,7 +770,7 @@ class FrameProvider:
                 controls["AwbMode"] = enum
 
         try:
-            self._picam.set_controls(controls)
+            self._set_controls(controls)
         except Exception:  # pragma: no cover - hardware specific failure path
             logger.exception("Failed to set camera controls: %s", controls)
 
@@ -365,10 +795,10 @@ class FrameProvider:
                     "FrameDurationLimits": (20000, 200000),
                     "NoiseReductionMode": 2,
                 }
-                self._picam.set_controls(controls)
+                self._set_controls(controls)
                 try:
                     if "HdrMode" in getattr(self._picam, "camera_controls", {}):
-                        self._picam.set_controls({"HdrMode": 3})
+                        self._set_controls({"HdrMode": 3})
                 except Exception:
                     logger.debug("HDR Night mode not available", exc_info=True)
             else:
@@ -381,10 +811,10 @@ class FrameProvider:
                 if self._low_light_enabled:
                     try:
                         if "HdrMode" in getattr(self._picam, "camera_controls", {}):
-                            self._picam.set_controls({"HdrMode": 0})
+                            self._set_controls({"HdrMode": 0})
                     except Exception:
                         logger.debug("Failed to disable HDR mode", exc_info=True)
-                self._picam.set_controls(controls)
+                self._set_controls(controls)
         except Exception:  # pragma: no cover - hardware specific failure path
             logger.exception("Failed to toggle low-light controls")
         finally:
@@ -398,11 +828,12 @@ class FrameProvider:
             "Saturation": float(settings.saturation),
             "Contrast": float(settings.contrast),
             "Sharpness": float(settings.sharpness),
+            "Brightness": max(-1.0, min(1.0, float(settings.brightness))),
             "ExposureValue": float(settings.ev),
         }
 
         try:
-            self._picam.set_controls(controls)
+            self._set_controls(controls)
         except Exception:  # pragma: no cover - hardware specific failure path
             logger.exception("Failed to set color controls: %s", controls)
 
@@ -410,10 +841,8 @@ class FrameProvider:
         if not PICAMERA_AVAILABLE:
             return
 
-        try:
-            zoom = max(1.0, min(4.0, float(level)))
-        except (TypeError, ValueError):
-            zoom = 1.0
+        # Zoom is range-checked on ingress (CameraSettingsPatch, set_zoom).
+        zoom = min(4.0, max(1.0, level))
 
         sensor_resolution = self._sensor_resolution
         if not sensor_resolution:
@@ -423,26 +852,34 @@ class FrameProvider:
             except Exception:  # pragma: no cover - hardware specific failure path
                 return
 
-        sensor_w, sensor_h = sensor_resolution
-        scale = 1.0 / zoom
-        crop_w = max(1, int(sensor_w * scale))
-        crop_h = max(1, int(sensor_h * scale))
-        x = max(0, (sensor_w - crop_w) // 2)
-        y = max(0, (sensor_h - crop_h) // 2)
-
         try:
-            self._picam.set_controls({"ScalerCrop": (x, y, crop_w, crop_h)})
+            self._set_controls({"ScalerCrop": _zoom_crop(zoom, *sensor_resolution)})
         except Exception:  # pragma: no cover - hardware specific failure path
             logger.exception("Failed to set zoom controls")
 
 
+_MJPEG_HEADER_TEMPLATE = (
+    f"--{JPEG_BOUNDARY}\r\n"
+    "Content-Type: image/jpeg\r\n"
+    "Content-Length: %d\r\n\r\n"
+).encode("ascii")
+MJPEG_PART_TRAILER = b"\r\n"
+
+
+def format_mjpeg_header(jpeg: bytes) -> bytes:
+    """Return the multipart header that precedes ``jpeg`` in the stream."""
+
+    return _MJPEG_HEADER_TEMPLATE % len(jpeg)
+
+
+def mjpeg_frame_parts(jpeg: bytes) -> tuple[bytes, bytes, bytes]:
+    """Split one multipart frame into chunks that can be sent without joining."""
+
+    return format_mjpeg_header(jpeg), jpeg, MJPEG_PART_TRAILER
+
+
 def format_mjpeg_frame(jpeg: bytes) -> bytes:
-    header = (
-        f"--{JPEG_BOUNDARY}\r\n"
-        "Content-Type: image/jpeg\r\n"
-        f"Content-Length: {len(jpeg)}\r\n\r\n"
-    ).encode("ascii")
-    return header + jpeg + b"\r\n"
+    return b"".join(mjpeg_frame_parts(jpeg))
 
 
 class MockFrameProvider(FrameProvider):
@@ -451,15 +888,25 @@ class MockFrameProvider(FrameProvider):
     def __init__(self, resolution: tuple[int, int] = DEFAULT_STREAM_SIZE) -> None:  # type: ignore[override]
         # Bypass FrameProvider.__init__ which requires Picamera2
         self._resolution = resolution
+        self._lores_resolution = None
         self._fps = DEFAULT_FPS
+        self._hardware_jpeg = False
+        self._recording = False
+        self._encoder_name: str | None = None
+        self._client_count_fn = None
         self._jpeg_quality = DEFAULT_JPEG_QUALITY
+        self._tj = None
+        self._stream_format = "BGR888"
         self._settings = CameraSettings()
         self._low_light_enabled = False
         self._default_frame_limits: tuple[int, int] | None = None
         self._sensor_resolution: tuple[int, int] | None = None
+        self._applied_controls: Dict[str, Any] = {}
         self._lock = threading.Lock()
         self._condition = threading.Condition(self._lock)
-        self._last_jpeg: Optional[bytes] = None
+        self._main = _FrameSlot()
+        self._lores: _FrameSlot | None = None
+        self._sync_waiters = 0
         self._running = False
         self._thread: Optional[threading.Thread] = None
         self._picam = None
@@ -468,6 +915,7 @@ class MockFrameProvider(FrameProvider):
         if self._running:
             return
         self._running = True
+        self._main.open()
         self._thread = threading.Thread(target=self._mock_loop, daemon=True)
         self._thread.start()
         set_active_frame_provider(self)
@@ -476,29 +924,45 @@ class MockFrameProvider(FrameProvider):
         with self._condition:
             self._running = False
             self._condition.notify_all()
+        self._main.close()
         if self._thread and self._thread.is_alive():
             self._thread.join(timeout=1.0)
         self._thread = None
         if get_active_frame_provider() is self:
             set_active_frame_provider(None)
         
-    def _mock_loop(self) -> None:
+    def _render_mock_base(self) -> Image.Image:
         from PIL import ImageDraw  # imported lazily to avoid heavy deps
 
         width, height = self._resolution
+        img = Image.new("RGB", self._resolution, (30, 30, 30))
+        draw = ImageDraw.Draw(img)
+        text = "Mock Camera"
+        draw.rectangle([(10, 10), (width - 10, height - 10)], outline=(0, 122, 255), width=4)
+        draw.text((20, 20), text, fill=(255, 255, 255))
+        return img
+
+    def _render_mock_jpeg(self, base: Image.Image, stamp: str) -> bytes:
+        from PIL import ImageDraw  # imported lazily to avoid heavy deps
+
+        img = base.copy()
+        ImageDraw.Draw(img).text((20, 40), stamp, fill=(180, 180, 180))
+        buffer = io.BytesIO()
+        img.save(buffer, format="JPEG", quality=self._jpeg_quality)
+        return buffer.getvalue()
+
+    def _mock_loop(self) -> None:
+        # The frame only changes when the clock ticks over, so render the base
+        # once and re-encode at most once per second.
+        base = self._render_mock_base()
+        stamp = ""
+        jpeg = b""
         while self._running:
-            img = Image.new("RGB", self._resolution, (30, 30, 30))
-            draw = ImageDraw.Draw(img)
-            text = "Mock Camera"
-            draw.rectangle([(10, 10), (width - 10, height - 10)], outline=(0, 122, 255), width=4)
-            draw.text((20, 20), text, fill=(255, 255, 255))
-
-            buffer = io.BytesIO()
-            img.save(buffer, format="JPEG", quality=self._jpeg_quality)
-            jpeg = buffer.getvalue()
-            with self._condition:
-                self._last_jpeg = jpeg
-                self._condition.notify_all()
+            now = time.strftime("%H:%M:%S")
+            if now != stamp:
+                stamp = now
+                jpeg = self._render_mock_jpeg(base, stamp)
+            self._publish_jpeg(jpeg)
             time.sleep(1.0 / self._fps)
 
     def _apply_controls(self, settings: CameraSettings) -> None:  # type: ignore[override]
@@ -2,17 +2,26 @@
 from __future__ import annotations
 
 import asyncio
+import gzip
+import json
 import logging
+import mimetypes
 import os
-from contextlib import asynccontextmanager
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 import typing
 from typing import Dict, Literal, Optional
 
-from fastapi import APIRouter, FastAPI, HTTPException, Request, Response
+from fastapi import APIRouter, FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import StreamingResponse
+from starlette.datastructures import Headers
+from starlette.staticfiles import NotModifiedResponse
+from starlette.types import Scope
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel, Field
 
 from .camera import (
@@ -21,7 +30,6 @@ from .camera import (
     PICAMERA_AVAILABLE,
     apply_color_and_quality,
     apply_wb_and_lowlight_combo,
-    format_mjpeg_frame,
     JPEG_BOUNDARY,
     set_zoom,
 )
@@ -70,12 +78,20 @@ class CameraSettingsPatch(BaseModel):
     contrast: Optional[float] = Field(None, ge=0.0, le=2.0)
     saturation: Optional[float] = Field(None, ge=0.0, le=2.0)
     sharpness: Optional[float] = Field(None, ge=0.0, le=2.0)
+    brightness: Optional[float] = Field(None, ge=-1.0, le=1.0)
     ev: Optional[float] = Field(None, ge=-3.0, le=3.0)
     low_light: Optional[bool] = None
     zoom: Optional[float] = Field(None, ge=1.0, le=4.0)
 
     def to_payload(self) -> Dict[str, object]:
-        return {k: v for k, v in self.model_dump(exclude_none=True).items()}
+        # Only fields present in the request body can be non-None, so iterate
+        # those instead of dumping and filtering the whole model.
+        payload: Dict[str, object] = {}
+        for name in self.model_fields_set:
+            value = getattr(self, name)
+            if value is not None:
+                payload[name] = value
+        return payload
 
 
 class PTZAbsolute(BaseModel):
@@ -97,12 +113,37 @@ class PTZNudge(BaseModel):
 # Providers wiring
 # ---------------------------
 
+# Written only from the event loop thread, with no await between read and
+# write, so no lock is needed; the capture thread only reads it. Defined
+# before the providers because FrameProvider.start() begins capturing at
+# import time and polls the count from its first frame on.
+_stream_clients = 0
+
+
+@contextmanager
+def _track_stream_client() -> typing.Iterator[None]:
+    global _stream_clients
+    _stream_clients += 1
+    try:
+        yield
+    finally:
+        _stream_clients = max(0, _stream_clients - 1)
+
+
+def _stream_client_count() -> int:
+    return _stream_clients
+
+
 def create_frame_provider() -> FrameProvider | MockFrameProvider:
     """Instantiate the real Picamera2 provider if available, otherwise Mock."""
-    use_mock = os.getenv("USE_MOCK_CAMERA", "0") == "1"
+    config = _load_server_config()
+    use_mock = config.use_mock_camera
     if not use_mock and PICAMERA_AVAILABLE:
         try:
-            provider = FrameProvider()
+            provider = FrameProvider(
+                hardware_jpeg=config.use_hw_jpeg,
+                client_count_fn=_stream_client_count,
+            )
             provider.start()
             logger.info("Camera provider: %s", provider.__class__.__name__)
             return provider
@@ -142,9 +183,39 @@ def _parse_float(name: str, default: float) -> float:
         return default
 
 
-def create_pantilt_controller() -> LgpioPanTilt | Pca9685PanTilt:
-    """Instantiate PTZ controller preferring PCA9685 with lgpio fallback."""
-
+def _parse_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).lower() in {"1", "true", "yes"}
+
+
+@dataclass(frozen=True, slots=True)
+class ServerConfig:
+    """Environment-derived settings, parsed once per process."""
+
+    use_mock_camera: bool
+    use_hw_jpeg: bool
+    frontend_origin: str
+    ptz_invert_pan: bool
+    ptz_invert_tilt: bool
+    pan_lim: tuple[float, float]
+    tilt_lim: tuple[float, float]
+    # None: try PCA9685 and fall back to lgpio; True: PCA9685 only; False: lgpio only
+    use_pca9685: Optional[bool]
+    i2c_bus: int
+    i2c_hz: int
+    pca9685_addr: int
+    pan_channel: int
+    tilt_channel: int
+    servo_hz: int
+    servo_min_us: int
+    servo_max_us: int
+    pan_gpio: int
+    tilt_gpio: int
+    # Per-client MJPEG rate cap; 0 sends every frame the camera produces
+    stream_max_fps: float
+
+
+@lru_cache(maxsize=1)
+def _load_server_config() -> ServerConfig:
     pan_lim = (
         _parse_float("PAN_MIN_DEG", -90.0),
         _parse_float("PAN_MAX_DEG", 90.0),
@@ -160,65 +231,90 @@ def create_pantilt_controller() -> LgpioPanTilt | Pca9685PanTilt:
         logger.warning("Invalid tilt limits %s. Using defaults.", tilt_lim)
         tilt_lim = (-70.0, 70.0)
 
-    use_pca_env = os.getenv("USE_PCA9685")
-    force_pca = use_pca_env == "1"
-    skip_pca = use_pca_env == "0"
-
-    if not skip_pca:
-        i2c_bus = _parse_int("I2C_BUS", 1)
-        address = _parse_int("PCA9685_ADDR", 0x40)
-        pan_channel = _parse_int("PAN_CHANNEL", 1)
-        tilt_channel = _parse_int("TILT_CHANNEL", 0)
-        servo_hz = _parse_int("SERVO_HZ", 50)
-        servo_min = _parse_int("SERVO_MIN_US", 500)
-        servo_max = _parse_int("SERVO_MAX_US", 2500)
-        if servo_min >= servo_max:
-            logger.warning(
-                "Invalid servo pulse range min=%s max=%s. Using defaults.",
-                servo_min,
-                servo_max,
-            )
-            servo_min, servo_max = 500, 2500
+    servo_min = _parse_int("SERVO_MIN_US", 500)
+    servo_max = _parse_int("SERVO_MAX_US", 2500)
+    if servo_min >= servo_max:
+        logger.warning(
+            "Invalid servo pulse range min=%s max=%s. Using defaults.",
+            servo_min,
+            servo_max,
+        )
+        servo_min, servo_max = 500, 2500
+
+    i2c_hz = _parse_int("I2C_HZ", 100_000)
+    if i2c_hz <= 0:
+        logger.warning("Invalid I2C_HZ=%s. Using default.", i2c_hz)
+        i2c_hz = 100_000
+
+    use_pca9685 = {"1": True, "0": False}.get(os.getenv("USE_PCA9685", ""))
+
+    return ServerConfig(
+        use_mock_camera=os.getenv("USE_MOCK_CAMERA", "0") == "1",
+        use_hw_jpeg=os.getenv("USE_HW_JPEG", "0") == "1",
+        frontend_origin=os.getenv("FRONTEND_ORIGIN", "http://localhost:5173"),
+        ptz_invert_pan=_parse_flag("PTZ_INVERT_PAN", "1"),
+        ptz_invert_tilt=_parse_flag("PTZ_INVERT_TILT", "1"),
+        pan_lim=pan_lim,
+        tilt_lim=tilt_lim,
+        use_pca9685=use_pca9685,
+        i2c_bus=_parse_int("I2C_BUS", 1),
+        i2c_hz=i2c_hz,
+        pca9685_addr=_parse_int("PCA9685_ADDR", 0x40),
+        pan_channel=_parse_int("PAN_CHANNEL", 1),
+        tilt_channel=_parse_int("TILT_CHANNEL", 0),
+        servo_hz=_parse_int("SERVO_HZ", 50),
+        servo_min_us=servo_min,
+        servo_max_us=servo_max,
+        pan_gpio=_parse_int("PAN_GPIO", 12),
+        tilt_gpio=_parse_int("TILT_GPIO", 13),
+        stream_max_fps=max(0.0, _parse_float("STREAM_MAX_FPS", 0.0)),
+    )
 
+
+def create_pantilt_controller() -> LgpioPanTilt | Pca9685PanTilt:
+    """Instantiate PTZ controller preferring PCA9685 with lgpio fallback."""
+
+    config = _load_server_config()
+
+    if config.use_pca9685 is not False:
         try:
             controller = Pca9685PanTilt(
-                i2c_bus=i2c_bus,
-                address=address,
-                pan_ch=pan_channel,
-                tilt_ch=tilt_channel,
-                pan_lim=pan_lim,
-                tilt_lim=tilt_lim,
-                servo_hz=servo_hz,
-                min_us=servo_min,
-                max_us=servo_max,
+                i2c_bus=config.i2c_bus,
+                i2c_hz=config.i2c_hz,
+                address=config.pca9685_addr,
+                pan_ch=config.pan_channel,
+                tilt_ch=config.tilt_channel,
+                pan_lim=config.pan_lim,
+                tilt_lim=config.tilt_lim,
+                servo_hz=config.servo_hz,
+                min_us=config.servo_min_us,
+                max_us=config.servo_max_us,
             )
             logger.info(
                 "PTZ provider: %s (i2c_bus=%d addr=0x%02X pan_ch=%d tilt_ch=%d)",
                 controller.__class__.__name__,
-                i2c_bus,
-                address,
-                pan_channel,
-                tilt_channel,
+                config.i2c_bus,
+                config.pca9685_addr,
+                config.pan_channel,
+                config.tilt_channel,
             )
             return controller
         except Exception:
-            if force_pca:
+            if config.use_pca9685:
                 raise
             logger.exception("Failed to initialize PCA9685 PTZ. Falling back to lgpio.")
 
-    pan_gpio = _parse_int("PAN_GPIO", 12)
-    tilt_gpio = _parse_int("TILT_GPIO", 13)
     controller = LgpioPanTilt(
-        pan_pin=pan_gpio,
-        tilt_pin=tilt_gpio,
-        pan_lim=pan_lim,
-        tilt_lim=tilt_lim,
+        pan_pin=config.pan_gpio,
+        tilt_pin=config.tilt_gpio,
+        pan_lim=config.pan_lim,
+        tilt_lim=config.tilt_lim,
     )
     logger.info(
         "PTZ provider: %s (pins pan=%d tilt=%d)",
         controller.__class__.__name__,
-        pan_gpio,
-        tilt_gpio,
+        config.pan_gpio,
+        config.tilt_gpio,
     )
     return controller
 
@@ -226,50 +322,23 @@ def create_pantilt_controller() -> LgpioPanTilt | Pca9685PanTilt:
 frame_provider = create_frame_provider()
 pantilt_controller = create_pantilt_controller()
 
-allowed_origin = os.getenv("FRONTEND_ORIGIN", "http://localhost:5173")
+allowed_origin = _load_server_config().frontend_origin
 
-PTZ_INVERT_PAN = os.getenv("PTZ_INVERT_PAN", "1").lower() in {"1", "true", "yes"}
-PTZ_INVERT_TILT = os.getenv("PTZ_INVERT_TILT", "1").lower() in {"1", "true", "yes"}
+PTZ_INVERT_PAN = _load_server_config().ptz_invert_pan
+PTZ_INVERT_TILT = _load_server_config().ptz_invert_tilt
 
 app = FastAPI(title="xEye Camera Controller", version="0.1.0")
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[allowed_origin],
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    # The API only uses these; listing them avoids echoing request headers.
+    allow_methods=["GET", "POST", "PATCH"],
+    allow_headers=["Content-Type"],
+    # Let browsers reuse a preflight for an hour (Chromium caps at 2 h).
+    max_age=3600,
 )
 
-_stream_clients = 0
-_stream_lock: asyncio.Lock | None = None
-
-
-def _get_stream_lock() -> asyncio.Lock:
-    global _stream_lock
-    if _stream_lock is None:
-        _stream_lock = asyncio.Lock()
-    return _stream_lock
-
-
-@asynccontextmanager
-async def _track_stream_client() -> None:
-    global _stream_clients
-    lock = _get_stream_lock()
-    async with lock:
-        _stream_clients += 1
-    try:
-        yield
-    finally:
-        async with lock:
-            _stream_clients = max(0, _stream_clients - 1)
-
-
-async def _stream_client_count() -> int:
-    lock = _get_stream_lock()
-    async with lock:
-        return _stream_clients
-
-
 @app.on_event("shutdown")
 async def shutdown_event() -> None:
     """Gracefully stop providers on shutdown."""
@@ -277,6 +346,7 @@ async def shutdown_event() -> None:
         frame_provider.stop()
     except Exception:
         logger.exception("Error stopping frame provider")
+    await _ptz_applier.stop()
     # LgpioPanTilt exposes close(); call it if available.
     close_fn = getattr(pantilt_controller, "close", None)
     if callable(close_fn):  # pragma: no cover - hardware path
@@ -290,9 +360,30 @@ async def shutdown_event() -> None:
 # Camera endpoints
 # ---------------------------
 
+def _json_response(body: bytes) -> Response:
+    return Response(content=body, media_type="application/json")
+
+
+def _encode_json(payload: Dict[str, object]) -> bytes:
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
+# CameraSettings is immutable, so its encoded body is reused until replaced.
+_settings_json_cache: tuple[object, bytes] | None = None
+
+
+def _camera_settings_json() -> bytes:
+    global _settings_json_cache
+    settings = frame_provider.settings
+    cached = _settings_json_cache
+    if cached is None or cached[0] is not settings:
+        cached = _settings_json_cache = (settings, _encode_json(settings.to_dict()))
+    return cached[1]
+
+
 @app.get("/api/camera/settings")
-async def get_camera_settings() -> Dict[str, object]:
-    return frame_provider.settings.to_dict()
+async def get_camera_settings() -> Response:
+    return _json_response(_camera_settings_json())
 
 
 @app.patch("/api/camera/settings")
@@ -304,7 +395,7 @@ async def patch_camera_settings(payload: CameraSettingsPatch) -> Dict[str, objec
     wb_preset = patch.pop("wb_preset", None)
     zoom_value = patch.pop("zoom", None)
     # Remove color keys handled by helper to avoid duplicate updates
-    for key in ("saturation", "contrast", "sharpness", "ev"):
+    for key in ("saturation", "contrast", "sharpness", "brightness", "ev"):
         patch.pop(key, None)
 
     if wb_preset is not None:
@@ -312,8 +403,9 @@ async def patch_camera_settings(payload: CameraSettingsPatch) -> Dict[str, objec
         patch.pop("low_light", None)
 
     try:
-        if any(value is not None for value in (payload.saturation, payload.contrast, payload.sharpness, payload.ev)):
-            apply_color_and_quality(payload.saturation, payload.contrast, payload.sharpness, payload.ev)
+        color_values = (payload.saturation, payload.contrast, payload.sharpness, payload.ev, payload.brightness)
+        if any(value is not None for value in color_values):
+            apply_color_and_quality(*color_values)
         if wb_preset is not None:
             apply_wb_and_lowlight_combo(wb_preset)
         if zoom_value is not None:
@@ -326,21 +418,40 @@ async def patch_camera_settings(payload: CameraSettingsPatch) -> Dict[str, objec
 
 
 @app.get("/api/stream.mjpg")
-async def stream_mjpeg(request: Request) -> StreamingResponse:
+async def stream_mjpeg(q: Literal["high", "low"] = "high") -> StreamingResponse:
     boundary = JPEG_BOUNDARY
+    # q=low serves the lores stream (falls back to main if not configured).
+    stream = "lores" if q == "low" else "main"
+    max_fps = _load_server_config().stream_max_fps
+    min_interval = 1.0 / max_fps if max_fps > 0 else 0.0
 
     async def frame_iterator() -> typing.AsyncGenerator[bytes, None]:
-        async with _track_stream_client():
+        last_seq: int | None = None
+        with _track_stream_client():
             try:
                 while frame_provider.is_running:
-                    jpeg = await frame_provider.wait_for_jpeg(timeout=1.0)
-                    if jpeg is None:
+                    # A slow client gets the newest frame once its previous
+                    # send drained; frames published meanwhile are dropped.
+                    published = await frame_provider.wait_for_frame_parts(
+                        timeout=1.0, stream=stream, after_seq=last_seq
+                    )
+                    if published is None:
                         if not frame_provider.is_running:
                             break
                         continue
-                    yield format_mjpeg_frame(jpeg)
-                    if await request.is_disconnected():
-                        break
+                    last_seq, parts = published
+                    sent_at = time.monotonic()
+                    # Header, payload and trailer are built once per frame and
+                    # shared by every client; send them as separate chunks so
+                    # the JPEG is never copied into a concatenated part.
+                    # No is_disconnected() poll per frame: StreamingResponse
+                    # cancels or closes this generator when the client goes.
+                    for chunk in parts:
+                        yield chunk
+                    if min_interval:
+                        delay = min_interval - (time.monotonic() - sent_at)
+                        if delay > 0:
+                            await asyncio.sleep(delay)
             except asyncio.CancelledError:  # pragma: no cover - cancellation path
                 logger.info("Client disconnected from MJPEG stream")
                 raise
@@ -355,7 +466,9 @@ async def stream_mjpeg(request: Request) -> StreamingResponse:
 
 @app.get("/api/snapshot.jpg")
 async def snapshot() -> Response:
-    frame = frame_provider.get_latest_jpeg(wait=True, timeout=2.0)
+    # The wait parks on a threading.Condition while encoding resumes; keep it
+    # off the event loop so streams, PTZ and /healthz are not stalled.
+    frame = await asyncio.to_thread(frame_provider.get_latest_jpeg, True, 2.0)
     if frame is None:
         raise HTTPException(status_code=503, detail="No frame available")
     return Response(content=frame, media_type="image/jpeg")
@@ -365,27 +478,126 @@ async def snapshot() -> Response:
 # PTZ helpers & endpoints
 # ---------------------------
 
-def _ptz_state_dict() -> Dict[str, object]:
-    """Build a PTZ state dict from the active controller attributes."""
+def _ptz_limits_dict() -> Dict[str, list[float]]:
     try:
-        pan = float(getattr(pantilt_controller, "pan_deg", 0.0))
-        tilt = float(getattr(pantilt_controller, "tilt_deg", 0.0))
         pan_lim = tuple(getattr(pantilt_controller, "pan_lim", (-90.0, 90.0)))
         tilt_lim = tuple(getattr(pantilt_controller, "tilt_lim", (-70.0, 70.0)))
     except Exception:
-        # Safe fallback if attributes are missing
-        pan, tilt = 0.0, 0.0
         pan_lim, tilt_lim = (-90.0, 90.0), (-70.0, 70.0)
     return {
-        "pan_deg": pan,
-        "tilt_deg": tilt,
-        "limits": {
-            "pan": [pan_lim[0], pan_lim[1]],
-            "tilt": [tilt_lim[0], tilt_lim[1]],
-        },
+        "pan": [pan_lim[0], pan_lim[1]],
+        "tilt": [tilt_lim[0], tilt_lim[1]],
     }
 
 
+# Limits are fixed once the controller is built.
+_PTZ_LIMITS = _ptz_limits_dict()
+
+
+class _PtzApplier:
+    """Coalesce PTZ commands into one target and apply it off the event loop.
+
+    Endpoints only move the target; a single task writes the latest target to
+    the controller, at most once per servo period, from a worker thread. A
+    dragged joystick therefore cannot queue overlapping glides, and the
+    blocking I2C/GPIO glide never stalls the event loop.
+    """
+
+    def __init__(self, controller: LgpioPanTilt | Pca9685PanTilt, period_s: float) -> None:
+        self._controller = controller
+        self._period_s = period_s
+        self._pan_lim = _PTZ_LIMITS["pan"]
+        self._tilt_lim = _PTZ_LIMITS["tilt"]
+        self.pan_deg = float(getattr(controller, "pan_deg", 0.0))
+        self.tilt_deg = float(getattr(controller, "tilt_deg", 0.0))
+        self._glide = False
+        self._dirty: asyncio.Event | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._inflight: asyncio.Future[None] | None = None
+
+    def set_target(self, pan: float, tilt: float, glide: bool) -> None:
+        self.pan_deg = max(self._pan_lim[0], min(self._pan_lim[1], float(pan)))
+        self.tilt_deg = max(self._tilt_lim[0], min(self._tilt_lim[1], float(tilt)))
+        self._glide = glide
+        if self._task is None:
+            self._dirty = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        self._dirty.set()
+
+    async def stop(self) -> None:
+        """Stop the applier and wait for any move still running in its thread."""
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        if self._inflight is not None:
+            try:
+                await self._inflight
+            except Exception:
+                logger.exception("PTZ move failed")
+            self._inflight = None
+
+    async def _run(self) -> None:
+        dirty = self._dirty
+        while True:
+            await dirty.wait()
+            dirty.clear()
+            # Shielded so cancelling the loop leaves the worker's future for
+            # stop() to wait on; the thread itself cannot be interrupted.
+            self._inflight = asyncio.ensure_future(
+                asyncio.to_thread(self._apply, self.pan_deg, self.tilt_deg, self._glide)
+            )
+            try:
+                await asyncio.shield(self._inflight)
+            except Exception:
+                logger.exception("PTZ move failed")
+            self._inflight = None
+            await asyncio.sleep(self._period_s)
+
+    def _apply(self, pan: float, tilt: float, glide: bool) -> None:
+        controller = self._controller
+        if glide:
+            controller.move_relative(pan - controller.pan_deg, tilt - controller.tilt_deg)
+        else:
+            controller.set_absolute(pan, tilt)
+
+
+_ptz_applier = _PtzApplier(pantilt_controller, 1.0 / max(1, _load_server_config().servo_hz))
+
+
+# One state dict for the process, updated in place after every move. It is
+# serialized as soon as a handler returns it, so sharing it is safe.
+# It reports the commanded target; the applier converges on it within a glide.
+_ptz_state: Dict[str, object] = {
+    "pan_deg": _ptz_applier.pan_deg,
+    "tilt_deg": _ptz_applier.tilt_deg,
+    "limits": _PTZ_LIMITS,
+}
+_ptz_state_json: bytes | None = None
+
+
+def _refresh_ptz_state() -> None:
+    global _ptz_state_json
+    _ptz_state["pan_deg"] = _ptz_applier.pan_deg
+    _ptz_state["tilt_deg"] = _ptz_applier.tilt_deg
+    _ptz_state_json = None
+
+
+def _ptz_state_dict() -> Dict[str, object]:
+    return _ptz_state
+
+
+def _ptz_state_body() -> bytes:
+    global _ptz_state_json
+    if _ptz_state_json is None:
+        _ptz_state_json = _encode_json(_ptz_state_dict())
+    return _ptz_state_json
+
+
 ptz_router = APIRouter(prefix="/api/ptz", tags=["ptz"])
 
 
@@ -400,34 +612,39 @@ def _apply_ptz_inversion(dpan: float, dtilt: float) -> tuple[float, float]:
 @ptz_router.post("/relative")
 async def ptz_relative(move: PTZNudge) -> Dict[str, object]:
     dpan, dtilt = _apply_ptz_inversion(move.pan_deg, move.tilt_deg)
-    pantilt_controller.move_relative(dpan, dtilt)
+    _ptz_applier.set_target(_ptz_applier.pan_deg + dpan, _ptz_applier.tilt_deg + dtilt, glide=True)
+    _refresh_ptz_state()
     return {"ok": True, **_ptz_state_dict()}
 
 
 @app.get("/api/pantilt")
-async def get_pantilt_state() -> Dict[str, object]:
-    return _ptz_state_dict()
+async def get_pantilt_state() -> Response:
+    # Polled by the UI; serve the encoded body cached until the next move.
+    return _json_response(_ptz_state_body())
 
 
 @app.post("/api/pantilt/absolute")
 async def pantilt_absolute(request: PTZAbsolute) -> Dict[str, object]:
     # Use current angles if any field is None
-    pan = request.pan_deg if request.pan_deg is not None else getattr(pantilt_controller, "pan_deg", 0.0)
-    tilt = request.tilt_deg if request.tilt_deg is not None else getattr(pantilt_controller, "tilt_deg", 0.0)
-    pantilt_controller.set_absolute(pan, tilt)  # LgpioPanTilt API
+    pan = request.pan_deg if request.pan_deg is not None else _ptz_applier.pan_deg
+    tilt = request.tilt_deg if request.tilt_deg is not None else _ptz_applier.tilt_deg
+    _ptz_applier.set_target(pan, tilt, glide=False)
+    _refresh_ptz_state()
     return _ptz_state_dict()
 
 
 @app.post("/api/pantilt/relative")
 async def pantilt_relative(request: PTZRelative) -> Dict[str, object]:
     dpan, dtilt = _apply_ptz_inversion(request.dpan_deg, request.dtilt_deg)
-    pantilt_controller.set_relative(dpan, dtilt)  # LgpioPanTilt API
+    _ptz_applier.set_target(_ptz_applier.pan_deg + dpan, _ptz_applier.tilt_deg + dtilt, glide=True)
+    _refresh_ptz_state()
     return _ptz_state_dict()
 
 
 @app.post("/api/pantilt/home")
 async def pantilt_home() -> Dict[str, object]:
-    pantilt_controller.home()
+    _ptz_applier.set_target(0.0, 0.0, glide=False)
+    _refresh_ptz_state()
     return _ptz_state_dict()
 
 
@@ -437,7 +654,7 @@ async def pantilt_home() -> Dict[str, object]:
 
 @app.get("/healthz")
 async def healthcheck() -> Dict[str, object]:
-    return {"ok": True, "clients": await _stream_client_count()}
+    return {"ok": True, "clients": _stream_client_count()}
 
 
 # ---------------------------
@@ -446,6 +663,88 @@ async def healthcheck() -> Dict[str, object]:
 
 app.include_router(ptz_router)
 
+_GZIP_SUFFIXES = {".html", ".js", ".css", ".svg", ".json", ".map", ".txt"}
+
+
+def _precompress_assets(directory: Path) -> set[str]:
+    """Write ``.gz`` siblings for text assets; return the paths that have one.
+
+    The build output is immutable per deployment, so this runs once at
+    startup and skips files whose ``.gz`` is already up to date.
+    """
+    compressed: set[str] = set()
+    for path in directory.rglob("*"):
+        if path.suffix not in _GZIP_SUFFIXES or not path.is_file():
+            continue
+        gz_path = path.with_name(path.name + ".gz")
+        try:
+            if not gz_path.exists() or gz_path.stat().st_mtime < path.stat().st_mtime:
+                gz_path.write_bytes(gzip.compress(path.read_bytes(), compresslevel=9, mtime=0))
+        except OSError:
+            logger.warning("Could not precompress %s", path, exc_info=True)
+            continue
+        compressed.add(str(path))
+    return compressed
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows gzip (RFC 9110 section 12.5.3).
+
+    An explicit ``gzip`` (or ``x-gzip``) token wins over ``*``; either one
+    counts only if its ``q`` is above zero.
+    """
+    wildcard: float | None = None
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding in ("gzip", "x-gzip"):
+            return q > 0
+        if coding == "*":
+            wildcard = q
+    return wildcard is not None and wildcard > 0
+
+
+class _GzipStaticFiles(StaticFiles):
+    """StaticFiles that serves the precompressed sibling to gzip-capable clients."""
+
+    def __init__(self, *, directory: Path, **kwargs: typing.Any) -> None:
+        super().__init__(directory=str(directory), **kwargs)
+        self._gzipped = _precompress_assets(directory)
+
+    def file_response(
+        self,
+        full_path: str | os.PathLike[str],
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        if str(full_path) not in self._gzipped:
+            return super().file_response(full_path, stat_result, scope, status_code)
+        request_headers = Headers(scope=scope)
+        if status_code != 200 or not _accepts_gzip(request_headers.get("accept-encoding", "")):
+            response = super().file_response(full_path, stat_result, scope, status_code)
+            response.headers["Vary"] = "Accept-Encoding"
+            return response
+        gz_path = f"{full_path}.gz"
+        response = FileResponse(
+            gz_path,
+            stat_result=os.stat(gz_path),
+            media_type=mimetypes.guess_type(str(full_path))[0] or "text/plain",
+            headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"},
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
 DIST_DIR = Path(__file__).resolve().parents[1] / "web" / "dist"
 if DIST_DIR.exists():
-    app.mount("/", StaticFiles(directory=str(DIST_DIR), html=True), name="frontend")
+    app.mount("/", _GzipStaticFiles(directory=DIST_DIR, html=True), name="frontend")
@@ -1,5 +1,6 @@
 # server/pantilt.py
 # Pan/Tilt providers for Raspberry Pi setups (PCA9685 I2C + lgpio fallback)
+import array
 import errno
 import threading
 import time
@@ -18,6 +19,18 @@ except Exception as e:
 
 MIN_STEP_DEG = 0.2
 GLIDE_MS = 200
+GLIDE_STEP_S = 0.005
+SPIN_S = 150e-6  # final stretch spun, covering nanosleep slack
+
+
+def _sleep_until(deadline: float) -> None:
+    # Sleep to just short of an absolute perf_counter() deadline, then spin,
+    # so per-step write time and sleep slack do not accumulate into drift.
+    remaining = deadline - time.perf_counter()
+    if remaining > SPIN_S + 50e-6:
+        time.sleep(remaining - SPIN_S)
+    while time.perf_counter() < deadline:
+        pass
 
 
 class PCA9685:
@@ -28,24 +41,37 @@ class PCA9685:
     LED0_ON_H = 0x07
     LED0_OFF_L = 0x08
     LED0_OFF_H = 0x09
+    MODE1_AI = 0x20  # register auto-increment, needed for block writes
+
+    OSC_SETTLE_S = 0.0005  # datasheet: oscillator is stable 500 us after wake
 
     def __init__(
         self,
         address=0x40,
         busnum=1,
         retry=5,
-        retry_delay=0.003,
+        retry_delay=None,
         debug=False,
+        bus_hz=100_000,
     ):
+        """
+        bus_hz is the I2C clock the bus actually runs at. The Pi defaults to
+        100 kHz; the PCA9685 handles fast mode, enabled with
+        dtparam=i2c_arm=on,i2c_arm_baudrate=400000 in /boot/firmware/config.txt.
+        Without an explicit retry_delay, retries back off for about five
+        8-byte transactions at that clock (at least 1 ms).
+        """
         if smbus is None:
             raise RuntimeError("python3-smbus not installed")
         self.bus = smbus.SMBus(busnum)
         self.address = address
         self.retry = retry
+        if retry_delay is None:
+            retry_delay = max(0.001, 5 * (9 * 8) / float(bus_hz))
         self.retry_delay = retry_delay
         self.debug = debug
         time.sleep(0.01)
-        self._write(self.MODE1, 0x00)  # wake
+        self._write(self.MODE1, self.MODE1_AI)  # wake, auto-increment on
         time.sleep(0.01)
         self._write(self.MODE2, 0x04)  # OUTDRV
         time.sleep(0.005)
@@ -65,6 +91,21 @@ class PCA9685:
                 continue
         raise BlockingIOError("I2C write failed after retries")
 
+    def _wbk(self, reg, vals):
+        for _ in range(self.retry):
+            try:
+                self.bus.write_i2c_block_data(self.address, reg, vals)
+                return
+            except OSError as e:
+                if getattr(e, "errno", None) in (errno.EAGAIN, 11):
+                    time.sleep(self.retry_delay)
+                    continue
+                raise
+            except BlockingIOError:
+                time.sleep(self.retry_delay)
+                continue
+        raise BlockingIOError("I2C block write failed after retries")
+
     def _rbd(self, reg):
         for _ in range(self.retry):
             try:
@@ -91,24 +132,42 @@ class PCA9685:
         prescale = max(3, min(255, prescale))
         oldmode = self._read(self.MODE1)
         self._write(self.MODE1, (oldmode & 0x7F) | 0x10)  # sleep
-        time.sleep(0.005)
+        time.sleep(self.OSC_SETTLE_S)
         self._write(self.PRESCALE, prescale)
         self._write(self.MODE1, oldmode)  # wake
-        time.sleep(0.005)
+        time.sleep(self.OSC_SETTLE_S)
         self._write(self.MODE1, oldmode | 0x80)  # restart
-        time.sleep(0.005)
+        time.sleep(self.OSC_SETTLE_S)
+
+    @staticmethod
+    def _pwm_bytes(on, off):
+        return [on & 0xFF, (on >> 8) & 0x0F, off & 0xFF, (off >> 8) & 0x0F]
+
+    @staticmethod
+    def _pulse_ticks(pulse_us, period_us):
+        ticks = int(round((float(pulse_us) * 4096.0) / float(period_us)))
+        return max(0, min(4095, ticks))
 
     def setPWM(self, channel, on, off):
-        base = self.LED0_ON_L + 4 * int(channel)
-        self._write(base + 0, on & 0xFF)
-        self._write(base + 1, (on >> 8) & 0x0F)
-        self._write(base + 2, off & 0xFF)
-        self._write(base + 3, (off >> 8) & 0x0F)
+        # one auto-incremented transaction for ON_L..OFF_H
+        self._wbk(self.LED0_ON_L + 4 * int(channel), self._pwm_bytes(on, off))
 
     def setServoPulse(self, channel, pulse_us, period_us=20000):
-        ticks = int(round((float(pulse_us) * 4096.0) / float(period_us)))
-        ticks = max(0, min(4095, ticks))
-        self.setPWM(channel, 0, ticks)
+        self.setPWM(channel, 0, self._pulse_ticks(pulse_us, period_us))
+
+    def setServoTicks(self, ticks):
+        """Write several {channel: off_ticks}; adjacent channels share one block write."""
+        channels = sorted(ticks)
+        start = 0
+        while start < len(channels):
+            end = start + 1
+            while end < len(channels) and channels[end] == channels[end - 1] + 1:
+                end += 1
+            data = []
+            for ch in channels[start:end]:
+                data += self._pwm_bytes(0, ticks[ch])
+            self._wbk(self.LED0_ON_L + 4 * channels[start], data)
+            start = end
 
 
 class Pca9685PanTilt:
@@ -123,41 +182,64 @@ class Pca9685PanTilt:
         servo_hz=50,
         min_us=500,
         max_us=2500,
+        i2c_hz=100_000,
     ):
-        self.pwm = PCA9685(address=address, busnum=i2c_bus)
+        self.pwm = PCA9685(address=address, busnum=i2c_bus, bus_hz=i2c_hz)
         self.pwm.setPWMFreq(servo_hz)
         self.pan_ch, self.tilt_ch = int(pan_ch), int(tilt_ch)
         self.pan_lim, self.tilt_lim = pan_lim, tilt_lim
+        self._pan_lo, self._pan_hi = float(pan_lim[0]), float(pan_lim[1])
+        self._tilt_lo, self._tilt_hi = float(tilt_lim[0]), float(tilt_lim[1])
         self.min_us, self.max_us = int(min_us), int(max_us)
+        # -90..+90 deg maps linearly onto min_us..max_us
+        self._us_per_deg = (self.max_us - self.min_us) / 180.0
+        self._us_offset = self.min_us + 90.0 * self._us_per_deg
+        # PWM ticks for every 0.1 deg in -90..+90; 0.1 deg ≈ 1 us, well under
+        # one ~4.9 us tick, so positions write without per-step float math.
+        self._tick_lut = array.array("H", (
+            PCA9685._pulse_ticks(self._deg_to_us(i / 10.0 - 90.0), 20000)
+            for i in range(1801)
+        ))
+        # The PCA9685 holds its last output, so identical writes are skipped.
+        self._last_ticks: tuple[int, int] | None = None
         self.pan_deg = 0.0
         self.tilt_deg = 0.0
         self.home()
 
     def _deg_to_us(self, deg: float) -> int:
         # map -90..+90 → min..max (or adjust if 0..180 fits better to your linkage)
-        # Here we assume -90..+90 -> min..max
-        deg = float(deg)
-        span = self.max_us - self.min_us
-        # normalize -90..+90 to 0..1
-        t = (deg + 90.0) / 180.0
-        return int(self.min_us + span * max(0.0, min(1.0, t)))
+        us = deg * self._us_per_deg + self._us_offset
+        return int(max(self.min_us, min(self.max_us, us)))
+
+    def _deg_to_ticks(self, deg: float) -> int:
+        return self._tick_lut[int((max(-90.0, min(90.0, deg)) + 90.0) * 10.0 + 0.5)]
 
-    def _clamp(self, value: float, limits: tuple[float, float]) -> float:
-        return float(max(limits[0], min(limits[1], value)))
+    def _clamp_pan(self, value: float) -> float:
+        return max(self._pan_lo, min(self._pan_hi, float(value)))
+
+    def _clamp_tilt(self, value: float) -> float:
+        return max(self._tilt_lo, min(self._tilt_hi, float(value)))
 
     def _write_position(self, pan: float, tilt: float) -> None:
-        self.pwm.setServoPulse(self.pan_ch, self._deg_to_us(pan))
-        self.pwm.setServoPulse(self.tilt_ch, self._deg_to_us(tilt))
+        self._write_ticks(self._deg_to_ticks(pan), self._deg_to_ticks(tilt))
+
+    def _write_ticks(self, pan_ticks: int, tilt_ticks: int) -> None:
+        ticks = (pan_ticks, tilt_ticks)
+        if ticks == self._last_ticks:
+            return
+        self.pwm.setServoTicks({self.pan_ch: pan_ticks, self.tilt_ch: tilt_ticks})
+        self._last_ticks = ticks
 
     def set_absolute(self, pan_deg: float, tilt_deg: float):
-        pan = self._clamp(pan_deg, self.pan_lim)
-        tilt = self._clamp(tilt_deg, self.tilt_lim)
+        pan = self._clamp_pan(pan_deg)
+        tilt = self._clamp_tilt(tilt_deg)
         self.pan_deg = pan
         self.tilt_deg = tilt
         self._write_position(self.pan_deg, self.tilt_deg)
 
     def _glide_to(self, pan_target: float, tilt_target: float, smooth_ms: int) -> None:
         steps = max(1, int(smooth_ms / 5))
+        dt = smooth_ms / 1000.0 / steps if smooth_ms > 0 else GLIDE_STEP_S
         pan_step = (pan_target - self.pan_deg) / steps
         tilt_step = (tilt_target - self.tilt_deg) / steps
 
@@ -167,19 +249,29 @@ class Pca9685PanTilt:
             self._write_position(self.pan_deg, self.tilt_deg)
             return
 
-        for _ in range(steps):
-            self.pan_deg += pan_step
-            self.tilt_deg += tilt_step
-            self._write_position(self.pan_deg, self.tilt_deg)
-            time.sleep(0.005)
+        # Precompute the whole trajectory (degrees and LUT ticks) so the timed
+        # loop only writes and sleeps; positions come from start + i * step,
+        # so no float error accumulates across steps.
+        pan_start, tilt_start = self.pan_deg, self.tilt_deg
+        trajectory = []
+        for i in range(1, steps + 1):
+            pan = pan_start + pan_step * i
+            tilt = tilt_start + tilt_step * i
+            trajectory.append((pan, tilt, self._deg_to_ticks(pan), self._deg_to_ticks(tilt)))
+
+        t0 = time.perf_counter()
+        for i, (pan, tilt, pan_ticks, tilt_ticks) in enumerate(trajectory, 1):
+            self.pan_deg, self.tilt_deg = pan, tilt
+            self._write_ticks(pan_ticks, tilt_ticks)
+            _sleep_until(t0 + i * dt)
 
         self.pan_deg = pan_target
         self.tilt_deg = tilt_target
         self._write_position(self.pan_deg, self.tilt_deg)
 
     def move_relative(self, dpan: float, dtilt: float, smooth_ms: int = GLIDE_MS):
-        target_pan = self._clamp(self.pan_deg + dpan, self.pan_lim)
-        target_tilt = self._clamp(self.tilt_deg + dtilt, self.tilt_lim)
+        target_pan = self._clamp_pan(self.pan_deg + dpan)
+        target_tilt = self._clamp_tilt(self.tilt_deg + dtilt)
         self._glide_to(target_pan, target_tilt, smooth_ms)
 
     def set_relative(self, dpan: float, dtilt: float):
@@ -194,10 +286,12 @@ class Pca9685PanTilt:
 
 class LgpioPanTilt:
     """
-    Software-PWM (50 Hz) Pan/Tilt for Raspberry Pi 5 via lgpio.
-    Generates 20 ms frames and sets a single high pulse per frame per servo.
-    Good enough for hobby servos; not jitter-free like pigpio, but works on Pi 5.
+    50 Hz servo Pan/Tilt for Raspberry Pi 5 via lgpio.
+    Pulse trains come from lgpio.tx_servo, timed by lgpio's own C thread, so no
+    Python loop spins to shape each 20 ms frame.
     """
+    SERVO_HZ = 50
+
     def __init__(self, pan_pin=12, tilt_pin=13, pan_lim=(-90, 90), tilt_lim=(-70, 70)):
         if lgpio is None:
             raise RuntimeError("lgpio not available. Install python3-lgpio.")
@@ -209,71 +303,50 @@ class LgpioPanTilt:
 
         self.pan_lim = pan_lim
         self.tilt_lim = tilt_lim
+        self._pan_lo, self._pan_hi = float(pan_lim[0]), float(pan_lim[1])
+        self._tilt_lo, self._tilt_hi = float(tilt_lim[0]), float(tilt_lim[1])
         self.pan_deg = 0.0
         self.tilt_deg = 0.0
 
-        # 50 Hz servo PWM
-        self._period_s = 0.020
         self._lock = threading.Lock()
-        self._running = True
-        self._t = threading.Thread(target=self._loop, daemon=True)
-        self._t.start()
+        # tx_servo keeps repeating the last pulse; only resend on change.
+        self._last_us: dict[int, int] = {}
+        self._set_position(0.0, 0.0)
+
+    # center 1500us, ±90° ≈ 500..2500us (adjust if your horns need different travel)
+    _US_PER_DEG = 1000 / 90.0
 
     def _deg_to_us(self, deg: float) -> int:
-        # center 1500us, ±90° ≈ 500..2500us (adjust if your horns need different travel)
-        return int(1500 + (deg / 90.0) * 1000)
+        return int(1500 + deg * self._US_PER_DEG)
 
-    def _pulse(self, pin: int, pw_us: int):
-        # Raise pin for pw_us microseconds inside the 20ms frame
-        if pw_us <= 0:
+    def _servo(self, pin: int, deg: float) -> None:
+        pw_us = max(500, min(2500, self._deg_to_us(deg)))
+        if self._last_us.get(pin) == pw_us:
             return
-        lgpio.gpio_write(self._h, pin, 1)
-        # busy-wait short micro-sleep for better accuracy (still software)
-        t_end = time.perf_counter() + pw_us / 1_000_000.0
-        while time.perf_counter() < t_end:
-            pass
-        lgpio.gpio_write(self._h, pin, 0)
-
-    def _loop(self):
-        # single thread schedules both channels to keep pulses aligned per frame
-        next_frame = time.perf_counter()
-        while self._running:
-            with self._lock:
-                pan_us  = max(500, min(2500, self._deg_to_us(self.pan_deg)))
-                tilt_us = max(500, min(2500, self._deg_to_us(self.tilt_deg)))
-                pan_pin, tilt_pin = self.pan_pin, self.tilt_pin
-
-            start = time.perf_counter()
-            # Start both low, then generate pulses (sequence doesn't matter for servos)
-            lgpio.gpio_write(self._h, pan_pin, 0)
-            lgpio.gpio_write(self._h, tilt_pin, 0)
-            # Pulse pan then tilt (or vice versa). For better overlap, you can interleave.
-            self._pulse(pan_pin, pan_us)
-            self._pulse(tilt_pin, tilt_us)
-
-            # frame pacing
-            next_frame += self._period_s
-            sleep = next_frame - time.perf_counter()
-            if sleep > 0:
-                time.sleep(sleep)
-            else:
-                next_frame = time.perf_counter() + self._period_s  # skip ahead if lag
-
-    def _clamp(self, value: float, limits: tuple[float, float]) -> float:
-        return float(max(limits[0], min(limits[1], value)))
+        lgpio.tx_servo(self._h, pin, pw_us, self.SERVO_HZ)
+        self._last_us[pin] = pw_us
+
+    def _clamp_pan(self, value: float) -> float:
+        return max(self._pan_lo, min(self._pan_hi, float(value)))
+
+    def _clamp_tilt(self, value: float) -> float:
+        return max(self._tilt_lo, min(self._tilt_hi, float(value)))
 
     def _set_position(self, pan: float, tilt: float) -> None:
         with self._lock:
             self.pan_deg = pan
             self.tilt_deg = tilt
+            self._servo(self.pan_pin, pan)
+            self._servo(self.tilt_pin, tilt)
 
     def set_absolute(self, pan_deg: float, tilt_deg: float):
-        pan = self._clamp(pan_deg, self.pan_lim)
-        tilt = self._clamp(tilt_deg, self.tilt_lim)
+        pan = self._clamp_pan(pan_deg)
+        tilt = self._clamp_tilt(tilt_deg)
         self._set_position(pan, tilt)
 
     def _glide_to(self, pan_target: float, tilt_target: float, smooth_ms: int) -> None:
         steps = max(1, int(smooth_ms / 5))
+        dt = smooth_ms / 1000.0 / steps if smooth_ms > 0 else GLIDE_STEP_S
         with self._lock:
             pan_start = self.pan_deg
             tilt_start = self.tilt_deg
@@ -284,12 +357,10 @@ class LgpioPanTilt:
             self._set_position(pan_target, tilt_target)
             return
 
-        current_pan, current_tilt = pan_start, tilt_start
-        for _ in range(steps):
-            current_pan += pan_step
-            current_tilt += tilt_step
-            self._set_position(current_pan, current_tilt)
-            time.sleep(0.005)
+        t0 = time.perf_counter()
+        for i in range(1, steps + 1):
+            self._set_position(pan_start + pan_step * i, tilt_start + tilt_step * i)
+            _sleep_until(t0 + i * dt)
 
         self._set_position(pan_target, tilt_target)
 
@@ -297,8 +368,8 @@ class LgpioPanTilt:
         with self._lock:
             pan_start = self.pan_deg
             tilt_start = self.tilt_deg
-        target_pan = self._clamp(pan_start + dpan, self.pan_lim)
-        target_tilt = self._clamp(tilt_start + dtilt, self.tilt_lim)
+        target_pan = self._clamp_pan(pan_start + dpan)
+        target_tilt = self._clamp_tilt(tilt_start + dtilt)
         self._glide_to(target_pan, target_tilt, smooth_ms)
 
     def set_relative(self, dpan: float, dtilt: float):
@@ -308,12 +379,9 @@ class LgpioPanTilt:
         self.set_absolute(0.0, 0.0)
 
     def close(self):
-        self._running = False
-        try:
-            self._t.join(timeout=0.5)
-        except: pass
         for p in (self.pan_pin, self.tilt_pin):
             try:
+                lgpio.tx_servo(self._h, p, 0)  # stop the pulse train
                 lgpio.gpio_write(self._h, p, 0)
                 lgpio.gpio_free(self._h, p)
             except: pass
@@ -51,6 +51,7 @@ export default function Controls({
   const contrast = Number(settings.contrast ?? 1);
   const saturation = Number(settings.saturation ?? 1);
   const sharpness = Number(settings.sharpness ?? 1);
+  const brightness = Number(settings.brightness ?? 0);
   const zoom = Number(settings.zoom ?? 1);
   const exposureComp = Number(settings.ev ?? 0);
   const awbMode = settings.awb_mode || 'auto';
@@ -189,6 +190,18 @@ export default function Controls({
               onChange={handleRange('ev')}
             />
           </div>
+          <div className="control-row">
+            <label htmlFor="brightness">Brightness ({brightness.toFixed(2)})</label>
+            <input
+              id="brightness"
+              type="range"
+              min="-1"
+              max="1"
+              step="0.05"
+              value={brightness}
+              onChange={handleRange('brightness')}
+            />
+          </div>
           <div className="control-row">
             <label htmlFor="contrast">Contrast ({contrast.toFixed(2)})</label>
             <input